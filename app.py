@@ -1,154 +1,546 @@
 import os
 import sys
 import time
+import re
 import json
+import functools
+import glob
+import hashlib
+import queue
+from array import array
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget,
-    QLabel, QSlider, QFileDialog, QHBoxLayout, QProgressBar, QDialog, QTextBrowser
+    QLabel, QSlider, QFileDialog, QHBoxLayout, QProgressBar, QDialog, QTextBrowser,
+    QStackedWidget
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap  # Dodane do obsługi okładki
-from ebooklib import epub, ITEM_DOCUMENT, ITEM_IMAGE
+from PyQt5.QtCore import Qt, QTimer, QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap  # Dodane do obsługi okładki
+from ebooklib import epub, ITEM_DOCUMENT, ITEM_IMAGE, ITEM_COVER
 from bs4 import BeautifulSoup
 
+try:
+    import lxml.html
+except ImportError:
+    # lxml jest opcjonalny — bez niego tekst wyciąga html.parser z BeautifulSoup
+    lxml = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson jest opcjonalny — bez niego pliki JSON obsługuje moduł json
+    orjson = None
+
 # Plik JSON przechowujący postęp czytania dla poszczególnych książek
 PROGRESS_JSON = "reading_progress.json"
 
 # Plik JSON przechowujący globalne ustawienia aplikacji (np. prędkość, czcionkę)
 SETTINGS_JSON = "app_settings.json"
 
-def load_all_progress():
+# Co ile słów / sekund zapisujemy postęp czytania na dysk
+PROGRESS_FLUSH_WORDS = 64
+PROGRESS_FLUSH_SECONDS = 2.0
+
+# Po ilu ms od ostatniej zmiany suwaka zapisujemy ustawienia
+SETTINGS_SAVE_DELAY_MS = 400
+
+# Przestrzenie nazw XML używane w META-INF/container.xml i pliku OPF
+CONTAINER_NS = {"c": "urn:oasis:names:tc:opendocument:xmlns:container"}
+OPF_NS = {"opf": "http://www.idpf.org/2007/opf"}
+
+# Katalog (obok PROGRESS_JSON) z miniaturami okładek gotowymi do wyświetlenia
+THUMBNAIL_DIR = "cover_thumbnails"
+
+# Rozmiar, do którego skalujemy okładkę w oknie
+COVER_WIDTH = 300
+COVER_HEIGHT = 400
+
+# Wyrażenie wyznaczające słowa tekstu (ciągi znaków innych niż białe)
+WORD_RE = re.compile(r'\S+')
+
+# Ile słów WordIndex indeksuje naprzód, gdy brakuje mu żądanego słowa
+WORD_INDEX_LOOKAHEAD = 1024
+
+# Elementy HTML rozdziałów, których treść nie jest tekstem książki
+NON_TEXT_TAGS = ("script", "style", "head")
+
+# Rozszerzenie pliku z tekstem wyciągniętym z EPUB, zapisywanego obok książki
+TEXT_CACHE_SUFFIX = ".rsvp.txt"
+
+# Wersja sposobu wyciągania tekstu z rozdziałów — podbijana przy każdej jego
+# zmianie, aby nie używać tekstów zapisanych przez starszą wersję
+TEXT_EXTRACTOR_VERSION = 2
+
+def load_json_file(path):
     """
-    Wczytuje z pliku JSON (PROGRESS_JSON) słownik z postępami czytania.
+    Wczytuje słownik z pliku JSON (przez orjson, jeśli jest dostępny).
     Jeśli plik nie istnieje lub jest niepoprawny, zwraca pusty słownik.
     """
-    if os.path.exists(PROGRESS_JSON):
+    if os.path.exists(path):
         try:
-            with open(PROGRESS_JSON, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(path, "rb") as f:
+                raw = f.read()
+            if orjson is not None:
+                return orjson.loads(raw)
+            return json.loads(raw.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError):
             return {}
     return {}
 
-def save_all_progress(data):
+def save_json_file(path, data):
     """
-    Zapisuje w pliku JSON (PROGRESS_JSON) słownik z postępami czytania.
+    Zapisuje słownik w pliku JSON (przez orjson, jeśli jest dostępny).
+    Dane trafiają najpierw do pliku tymczasowego, który następnie zastępuje
+    docelowy przez os.replace — przerwanie zapisu nie uszkodzi więc pliku.
     """
-    with open(PROGRESS_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+    os.replace(tmp_path, path)
 
-def load_progress(file_path):
+def load_all_progress():
     """
-    Zwraca zapamiętany indeks słowa (postęp) dla danej ścieżki pliku EPUB.
-    Jeśli nie ma takiego wpisu, zwraca 0.
+    Wczytuje z pliku JSON (PROGRESS_JSON) słownik z postępami czytania.
+    Jeśli plik nie istnieje lub jest niepoprawny, zwraca pusty słownik.
     """
-    data = load_all_progress()
-    return data.get(file_path, 0)
+    return load_json_file(PROGRESS_JSON)
 
-def save_progress(file_path, index):
+def save_all_progress(data):
     """
-    Zapisuje indeks słowa (postęp) dla danej ścieżki pliku EPUB
-    w słowniku i aktualizuje plik JSON.
+    Zapisuje w pliku JSON (PROGRESS_JSON) słownik z postępami czytania.
     """
-    data = load_all_progress()
-    data[file_path] = index
-    save_all_progress(data)
+    save_json_file(PROGRESS_JSON, data)
 
-def extract_text_from_epub(file_path):
+def _document_text(item):
     """
-    Wyciąga cały tekst (z wszystkich rozdziałów) z pliku EPUB.
+    Zwraca tekst pojedynczego rozdziału (elementu ITEM_DOCUMENT) EPUB.
+    Pomija zawartość elementów z NON_TEXT_TAGS (skrypty, style, nagłówek).
+    Jeśli dostępny jest lxml, używa jego parsera (napisanego w C),
+    w przeciwnym razie wolniejszego html.parser z BeautifulSoup.
+    """
+    content = item.get_content()
+    if lxml is not None:
+        try:
+            tree = lxml.html.fromstring(content)
+        except (lxml.etree.ParserError, ValueError):
+            # Np. pusty dokument — spróbujmy jeszcze html.parser
+            pass
+        else:
+            # with_tail=False: tekst tuż za usuwanym elementem należy do rozdziału
+            lxml.etree.strip_elements(tree, *NON_TEXT_TAGS, with_tail=False)
+            return ''.join(tree.itertext())
+    soup = BeautifulSoup(content, 'html.parser')
+    for tag in soup(NON_TEXT_TAGS):
+        tag.decompose()
+    return soup.get_text()
+
+def _iter_chapters(book):
+    """
+    Zwraca kolejno tekst rozdziałów wczytanej książki (epub.EpubBook).
+    Drzewo HTML rozdziału jest zwalniane przed parsowaniem następnego.
     """
-    book = epub.read_epub(file_path)
-    text = []
     for item in book.get_items():
         if item.get_type() == ITEM_DOCUMENT:
-            soup = BeautifulSoup(item.get_content(), 'html.parser')
-            text.append(soup.get_text())
-    return ' '.join(text)
+            yield _document_text(item)
 
-def extract_cover_image_from_epub(file_path):
+def _cover_from_metadata(book):
     """
-    Zwraca surowe dane (bytes) okładki EPUB, jeśli uda się ją znaleźć.
-    W przeciwnym wypadku zwraca None.
+    Zwraca dane okładki wskazanej w metadanych OPF: przez <meta name="cover">
+    (EPUB 2) lub element manifestu z properties="cover-image" (EPUB 3).
+    Jeśli metadane nie wskazują okładki, zwraca None.
     """
-    book = epub.read_epub(file_path)
+    for _, attrs in book.get_metadata('OPF', 'cover'):
+        cover_ref = attrs.get('content')
+        if not cover_ref:
+            continue
+        # Niektóre książki podają tu ścieżkę pliku zamiast identyfikatora
+        item = book.get_item_with_id(cover_ref) or book.get_item_with_href(cover_ref)
+        if item is not None:
+            return item.get_content()
+    for item in book.get_items_of_type(ITEM_COVER):
+        return item.get_content()
+    return None
+
+def _cover_from_book(book):
+    """
+    Zwraca dane okładki z wczytanej już książki (epub.EpubBook):
+    najpierw według metadanych OPF, a jeśli ich brak — pierwszy obrazek,
+    który ma w nazwie "cover". Jeśli nic nie znajdzie, zwraca None.
+    """
+    cover_data = _cover_from_metadata(book)
+    if cover_data is not None:
+        return cover_data
     for item in book.get_items():
         # Szukamy elementu typu ITEM_IMAGE, który ma w nazwie "cover"
         if item.get_type() == ITEM_IMAGE and 'cover' in item.get_name().lower():
             return item.get_content()
     return None
 
+def extract_cover_fast(file_path):
+    """
+    Zwraca surowe dane (bytes) okładki EPUB, czytając z archiwum ZIP tylko
+    META-INF/container.xml, plik OPF i sam obrazek okładki — bez parsowania
+    i rozpakowywania rozdziałów przez ebooklib.
+    Jeśli okładki nie da się w ten sposób znaleźć, zwraca None.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            container = ET.fromstring(zf.read("META-INF/container.xml"))
+            rootfile = container.find(".//c:rootfile", CONTAINER_NS)
+            if rootfile is None or not rootfile.get("full-path"):
+                return None
+            opf_path = rootfile.get("full-path")
+            opf = ET.fromstring(zf.read(opf_path))
+            items = opf.findall("opf:manifest/opf:item", OPF_NS)
+
+            cover_item = None
+            # EPUB 2: <meta name="cover" content="ID"/>
+            meta = opf.find(".//opf:meta[@name='cover']", OPF_NS)
+            if meta is not None:
+                cover_id = meta.get("content")
+                cover_item = next((i for i in items if i.get("id") == cover_id), None)
+            # EPUB 3: <item properties="cover-image" .../>
+            if cover_item is None:
+                cover_item = next(
+                    (i for i in items if "cover-image" in (i.get("properties") or "").split()),
+                    None
+                )
+            # Ostatecznie: obrazek, który ma w nazwie "cover"
+            if cover_item is None:
+                cover_item = next(
+                    (i for i in items
+                     if (i.get("media-type") or "").startswith("image/")
+                     and "cover" in (i.get("href") or "").lower()),
+                    None
+                )
+            if cover_item is None or not cover_item.get("href"):
+                return None
+
+            # Ścieżki w manifeście są względne wobec katalogu pliku OPF
+            cover_path = posixpath.normpath(
+                posixpath.join(posixpath.dirname(opf_path), unquote(cover_item.get("href")))
+            )
+            return zf.read(cover_path)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, IOError):
+        return None
+
+def source_signature(file_path):
+    """
+    Zwraca napis identyfikujący wersję pliku: czas modyfikacji (w ns) i rozmiar.
+    Sam czas nie wystarcza — kopiowanie (cp -p, rsync -a, rozpakowanie)
+    często zachowuje stary znacznik czasu podmienionej książki.
+    """
+    stat = os.stat(file_path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+def _text_cache_header(signature):
+    """
+    Zwraca pierwszą linię pliku z tekstem książki (TEXT_CACHE_SUFFIX).
+    """
+    return f"rsvp-text v{TEXT_EXTRACTOR_VERSION} {signature}\n"
+
+def load_text_cache(file_path, signature):
+    """
+    Zwraca tekst książki zapisany wcześniej obok pliku EPUB (TEXT_CACHE_SUFFIX).
+    Jeśli plik nie istnieje, został zapisany dla innej wersji książki
+    (signature) lub innej wersji wyciągania tekstu albo nie da się go odczytać,
+    zwraca None.
+    """
+    cache_path = file_path + TEXT_CACHE_SUFFIX
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8", newline="") as f:
+            if f.readline() != _text_cache_header(signature):
+                return None
+            return f.read()
+    except (IOError, UnicodeDecodeError):
+        return None
+
+def save_text_cache(file_path, signature, text):
+    """
+    Zapisuje tekst książki obok pliku EPUB, aby kolejne otwarcia
+    nie wymagały ponownego parsowania EPUB. Pierwsza linia pliku
+    zawiera sygnaturę książki (source_signature) i wersję wyciągania tekstu.
+    Plik powstaje najpierw jako tymczasowy i dopiero w całości zastępuje
+    docelowy (os.replace), więc przerwany zapis nie zostawi uciętego tekstu.
+    """
+    cache_path = file_path + TEXT_CACHE_SUFFIX
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(_text_cache_header(signature))
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except IOError:
+        # Brak prawa zapisu w katalogu książki nie powinien blokować czytania
+        try:
+            os.remove(tmp_path)
+        except IOError:
+            pass
+
+def _thumbnail_prefix(file_path):
+    """
+    Zwraca wspólny początek ścieżek miniatur okładki danej książki.
+    """
+    return os.path.join(THUMBNAIL_DIR, hashlib.sha1(file_path.encode("utf-8")).hexdigest())
+
+def cover_thumbnail_path(file_path, signature):
+    """
+    Zwraca ścieżkę miniatury okładki dla danej ścieżki pliku EPUB
+    i jego sygnatury (source_signature) — podmieniona książka ma więc
+    osobną miniaturę.
+    """
+    return f"{_thumbnail_prefix(file_path)}-{signature}.png"
+
+def load_cover_thumbnail(file_path, signature):
+    """
+    Zwraca zapisaną miniaturę okładki (QImage) dla tej wersji książki
+    lub None, jeśli jej nie ma.
+    """
+    thumb_path = cover_thumbnail_path(file_path, signature)
+    if not os.path.exists(thumb_path):
+        return None
+    image = QImage(thumb_path)
+    return None if image.isNull() else image
+
+def make_cover_thumbnail(file_path, signature, cover_data):
+    """
+    Dekoduje okładkę EPUB, skaluje ją do COVER_WIDTH x COVER_HEIGHT
+    i zapisuje jako miniaturę w THUMBNAIL_DIR (usuwając miniatury
+    poprzednich wersji książki). Zwraca QImage lub None, jeśli danych
+    okładki nie da się zdekodować.
+    Używa QImage (nie QPixmap), więc może działać poza wątkiem GUI.
+    """
+    image = QImage()
+    if not image.loadFromData(cover_data):
+        return None
+    # Duże okładki najpierw szybko zmniejszamy do ~2x docelowego rozmiaru,
+    # żeby wygładzanie działało już na niewielkim obrazie
+    if image.width() > 4 * COVER_WIDTH:
+        image = image.scaled(2 * COVER_WIDTH, 2 * COVER_HEIGHT,
+                             Qt.KeepAspectRatio, Qt.FastTransformation)
+    # Skalowanie okładki, aby pasowała do widoku
+    image = image.scaled(COVER_WIDTH, COVER_HEIGHT, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    thumb_path = cover_thumbnail_path(file_path, signature)
+    try:
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        for old_path in glob.glob(glob.escape(_thumbnail_prefix(file_path)) + "-*.png"):
+            if old_path != thumb_path:
+                os.remove(old_path)
+        image.save(thumb_path, "PNG")
+    except OSError:
+        # Brak miniatury spowolni tylko kolejne otwarcie książki
+        pass
+    return image
+
+@functools.lru_cache(maxsize=8)
+def _load_epub_cached(file_path, signature, with_cover):
+    """
+    Właściwa implementacja load_epub_once; sygnatura pliku (source_signature)
+    jest częścią klucza cache, więc zmiana pliku EPUB unieważnia zapamiętany wynik.
+    """
+    # Okładkę czytamy bezpośrednio z archiwum ZIP, bez ebooklib
+    cover_data = extract_cover_fast(file_path) if with_cover else None
+
+    text = load_text_cache(file_path, signature)
+    if text is not None:
+        return text, cover_data
+
+    # Pełne parsowanie EPUB jest potrzebne tylko do wyciągnięcia tekstu
+    book = epub.read_epub(file_path)
+    text = ' '.join(_iter_chapters(book))
+    save_text_cache(file_path, signature, text)
+    if with_cover and cover_data is None:
+        # Nietypowa struktura archiwum — szukamy okładki we wczytanej książce
+        cover_data = _cover_from_book(book)
+    return text, cover_data
+
+def load_epub_once(file_path, signature, with_cover=True):
+    """
+    Wczytuje plik EPUB jednym przebiegiem i zwraca krotkę (tekst, okładka),
+    gdzie okładka to surowe dane (bytes) lub None. Przy with_cover=False
+    (np. gdy jest już miniatura) okładka nie jest czytana i zawsze jest None.
+    signature to sygnatura pliku z source_signature.
+    Wyniki są zapamiętywane w pamięci (dla ścieżki i sygnatury pliku)
+    oraz w pliku z tekstem obok książki.
+    """
+    return _load_epub_cached(file_path, signature, with_cover)
+
 def load_app_settings():
     """
     Wczytuje ustawienia aplikacji (prędkość słów, wielkość czcionki) z pliku SETTINGS_JSON.
     Jeśli plik nie istnieje lub jest niepoprawny, zwraca pusty słownik.
     """
-    if os.path.exists(SETTINGS_JSON):
-        try:
-            with open(SETTINGS_JSON, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
-    return {}
+    return load_json_file(SETTINGS_JSON)
 
 def save_app_settings(settings):
     """
     Zapisuje w pliku JSON (SETTINGS_JSON) słownik z ustawieniami aplikacji.
     """
-    with open(SETTINGS_JSON, "w", encoding="utf-8") as f:
-        json.dump(settings, f, ensure_ascii=False, indent=2)
+    save_json_file(SETTINGS_JSON, settings)
 
-class WordDisplayThread(QThread):
+@functools.lru_cache(maxsize=4096)
+def _split_word(word):
     """
-    Wątek odpowiedzialny za wyświetlanie słów w zadanym tempie
-    (words_per_minute) oraz emitowanie sygnałów do aktualizacji
-    labelki z tekstem i paska postępu.
+    Dzieli słowo na krotkę (początek, środkowa litera, koniec).
+    Słownictwo książki jest dużo mniejsze od liczby słów, więc wyniki
+    zapamiętujemy zamiast dzielić to samo słowo przy każdym wyświetleniu.
     """
-    word_signal = pyqtSignal(str)
-    progress_signal = pyqtSignal(int)
+    middle_index = len(word) // 2
+    return word[:middle_index], word[middle_index:middle_index + 1], word[middle_index + 1:]
 
-    def __init__(self, file_path, text, words_per_minute):
-        super().__init__()
-        self.file_path = file_path
+class WordIndex:
+    """
+    Indeks słów tekstu książki. Zamiast listy napisów trzyma tablice pozycji
+    początku i końca każdego słowa, a same słowa wycina z tekstu na żądanie.
+    Tekst jest indeksowany leniwie — tylko do słowa, o które ktoś zapytał
+    (plus WORD_INDEX_LOOKAHEAD), więc wyświetlanie może ruszyć od razu.
+    """
+    def __init__(self, text):
         self.text = text
-        self.words_per_minute = words_per_minute
-        self.running = True
-        self.current_index = 0
+        self.starts = array('i')
+        self.ends = array('i')
+        self._scan_pos = 0  # Pozycja w tekście, do której sięga indeks
+        self._complete = not text
 
-    def run(self):
-        words = self.text.split()
-        # Odczytujemy zapisany postęp dla danej książki
-        start_index = load_progress(self.file_path)
-        delay = 60 / self.words_per_minute
-        total_words = len(words)
+    def _extend(self, count):
+        """
+        Indeksuje kolejne słowa, aż indeks obejmie co najmniej count słów
+        albo cały tekst.
+        """
+        if self._complete or len(self.starts) >= count:
+            return
+        target = count + WORD_INDEX_LOOKAHEAD
+        for match in WORD_RE.finditer(self.text, self._scan_pos):
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+            if len(self.starts) >= target:
+                self._scan_pos = match.end()
+                return
+        self._scan_pos = len(self.text)
+        self._complete = True
+
+    def available(self, count):
+        """
+        Zwraca, ile z pierwszych count słów istnieje w tekście.
+        """
+        self._extend(count)
+        return min(count, len(self.starts))
 
-        try:
-            for i in range(start_index, total_words):
-                if not self.running:
-                    break
-                self.current_index = i
-                self.word_signal.emit(words[i])
-                progress = int((i + 1) / total_words * 100)
-                self.progress_signal.emit(progress)
-                time.sleep(delay)
-                # Zapisujemy postęp w pliku JSON
-                save_progress(self.file_path, i + 1)
-        except KeyboardInterrupt:
-            # W razie nagłego przerwania wątku, i tak zapiszmy bieżący postęp
-            save_progress(self.file_path, self.current_index)
+    def has_word(self, index):
+        """
+        Sprawdza, czy tekst ma słowo o podanym indeksie.
+        """
+        return self.available(index + 1) > index
+
+    def word(self, index):
+        """
+        Zwraca słowo o podanym indeksie.
+        """
+        self._extend(index + 1)
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def percent_read(self, count):
+        """
+        Zwraca, jaki procent tekstu (liczony w znakach) zajmuje pierwsze
+        count słów. Dzięki temu postęp nie wymaga znajomości liczby
+        wszystkich słów, a więc indeksowania całej książki.
+        """
+        if count <= 0 or not self.text:
+            return 0
+        self._extend(count + 1)
+        if self._complete and count >= len(self.starts):
+            # Przeczytano ostatnie słowo (za nim mogą być już tylko białe znaki)
+            return 100
+        return self.ends[count - 1] * 100 // len(self.text)
+
+class ProgressWriter(QThread):
+    """
+    Wątek zapisujący postępy czytania do pliku JSON, aby wyświetlanie słów
+    nigdy nie czekało na dysk. Zapisy trafiają do kolejki i są wykonywane
+    po kolei, więc na dysku zawsze ląduje ostatnia przekazana wersja.
+    """
+    def __init__(self):
+        super().__init__()
+        self._queue = queue.Queue()
+
+    def enqueue(self, data):
+        """
+        Zleca zapis słownika z postępami (przekazanego jako kopia).
+        """
+        self._queue.put(data)
 
     def stop(self):
-        self.running = False
+        """
+        Kończy wątek po wykonaniu wszystkich zleconych wcześniej zapisów.
+        """
+        self._queue.put(None)
+
+    def run(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            try:
+                save_all_progress(data)
+            except (OSError, TypeError, ValueError) as e:
+                # Nieudany zapis powtórzy się przy kolejnym zleceniu — wyjątek
+                # nie może zakończyć wątku, bo kolejne zapisy by przepadły
+                print(f"Could not save reading progress: {e}", file=sys.stderr)
+
+class EpubLoaderSignals(QObject):
+    """
+    Sygnały zadania EpubLoader (QRunnable nie jest QObject, więc nie może
+    mieć własnych sygnałów).
+    """
+    # Tekst jako object: przekazujemy referencję do napisu Pythona, zamiast
+    # konwertować całą książkę na QString i z powrotem (w wątku GUI)
+    done = pyqtSignal(str, object, object)  # ścieżka, tekst, okładka (QImage lub None)
+    failed = pyqtSignal(str, str)  # ścieżka, opis błędu
+
+class EpubLoader(QRunnable):
+    """
+    Zadanie dla QThreadPool wczytujące plik EPUB poza wątkiem GUI,
+    aby okno nie zamarzało podczas parsowania dużych książek.
+    """
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = EpubLoaderSignals()
+
+    def run(self):
+        try:
+            signature = source_signature(self.file_path)
+            # Gotowa miniatura okładki pozwala pominąć czytanie okładki z EPUB
+            cover_image = load_cover_thumbnail(self.file_path, signature)
+            text, cover_data = load_epub_once(self.file_path, signature,
+                                              with_cover=cover_image is None)
+            if cover_image is None and cover_data:
+                cover_image = make_cover_thumbnail(self.file_path, signature, cover_data)
+        except Exception as e:
+            # Wyjątek w wątku puli by przepadł, a okno zostałoby zablokowane
+            self.signals.failed.emit(self.file_path, str(e))
+            return
+        self.signals.done.emit(self.file_path, text, cover_image)
 
 class ContextWindow(QDialog):
     """
     Okno wyświetlające kontekst wokół aktualnie czytanego słowa.
     """
-    def __init__(self, parent, text, current_index):
+    def __init__(self, parent, word_index, current_index):
         super().__init__(parent)
         self.setWindowTitle("Context Viewer")
         self.setGeometry(200, 200, 600, 400)
-        self.text = text
+        self.word_index = word_index
         self.current_index = current_index
         self.init_ui()
 
@@ -161,17 +553,20 @@ class ContextWindow(QDialog):
         self.setLayout(layout)
 
     def update_context(self):
-        words = self.text.split()
-        start = max(0, self.current_index - 60)
-        end = min(len(words), self.current_index + 61)
-
-        context = []
-        for i in range(start, end):
-            if i == self.current_index:
-                context.append(f'<span style="color: red; font-weight: bold;">{words[i]}</span>')
-            else:
-                context.append(words[i])
-        self.text_browser.setHtml(" ".join(context))
+        index = self.word_index
+        current = self.current_index
+        start = max(0, current - 60)
+        end = index.available(current + 61)
+
+        # Kontekst wycinamy z tekstu książki w całości, podświetlając tylko
+        # bieżące słowo (białe znaki i tak zwijają się w HTML do spacji)
+        text = index.text
+        context = (
+            text[index.starts[start]:index.starts[current]] +
+            f'<span style="color: red; font-weight: bold;">{index.word(current)}</span>' +
+            text[index.ends[current]:index.ends[end - 1]]
+        )
+        self.text_browser.setHtml(context)
 
 class MainWindow(QMainWindow):
     """
@@ -189,8 +584,35 @@ class MainWindow(QMainWindow):
         self.load_settings_from_file()
 
         self.text = ""
-        self.thread = None
+        self.word_index = WordIndex("")  # Pozycje słów w tekście — liczone na bieżąco
         self.current_file_path = None  # Trzymamy ścieżkę do aktualnie otwartej książki
+        self.current_index = None  # Indeks aktualnie wyświetlanego słowa
+        self._loader = None  # Trwające wczytywanie pliku EPUB (EpubLoader)
+
+        # Postępy wszystkich książek trzymamy w pamięci i zapisujemy je
+        # na dysk tylko co jakiś czas, zamiast po każdym słowie
+        self._progress_cache = load_all_progress()
+        self._last_flush = time.monotonic()
+        self._progress_writer = ProgressWriter()
+        self._progress_writer.start()
+        # Aplikację można zakończyć bez zamykania okna (QApplication.quit(),
+        # wylogowanie) — wtedy też trzeba zapisać postęp i zakończyć wątek
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
+
+        # Słowa wyświetla timer w wątku GUI — przy maks. 10 słowach na sekundę
+        # osobny wątek nie jest potrzebny
+        self._idx = 0  # Indeks następnego słowa do wyświetlenia
+        self._last_progress = -1  # Ostatnia wartość ustawiona na pasku postępu
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+        # Ustawienia zapisujemy dopiero po chwili bez zmian suwaków, więc
+        # przeciągnięcie suwaka kończy się jednym zapisem zamiast setkami
+        self._settings_save_timer = QTimer(self)
+        self._settings_save_timer.setSingleShot(True)
+        self._settings_save_timer.setInterval(SETTINGS_SAVE_DELAY_MS)
+        self._settings_save_timer.timeout.connect(self.save_current_settings)
 
         self.init_ui()
 
@@ -210,12 +632,36 @@ class MainWindow(QMainWindow):
         self.layout.addWidget(self.cover_label)
 
         # ---------------------------------------
-        # 2. Label wyświetlający aktualne słowo
+        # 2. Label z komunikatami oraz trzy labelki wyświetlające aktualne słowo
+        #    (początek, środkowa litera na czerwono, koniec) — zwykły tekst,
+        #    więc przy każdym słowie Qt nie musi parsować HTML
         # ---------------------------------------
         self.word_label = QLabel("Load an EPUB file to start", self)
         self.word_label.setAlignment(Qt.AlignCenter)
-        self.word_label.setStyleSheet(f"font-size: {self.font_size}px; background-color: rgb(235, 222, 200);")
-        self.layout.addWidget(self.word_label)
+
+        self.left_lbl = QLabel(self)
+        self.left_lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.mid_lbl = QLabel(self)
+        self.mid_lbl.setAlignment(Qt.AlignCenter)
+        self.right_lbl = QLabel(self)
+        self.right_lbl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        for label in (self.left_lbl, self.mid_lbl, self.right_lbl):
+            label.setTextFormat(Qt.PlainText)
+
+        word_layout = QHBoxLayout()
+        word_layout.setSpacing(0)
+        # Równe rozciąganie boków utrzymuje środkową literę na środku okna
+        word_layout.addWidget(self.left_lbl, 1)
+        word_layout.addWidget(self.mid_lbl)
+        word_layout.addWidget(self.right_lbl, 1)
+        self.word_container = QWidget(self)
+        self.word_container.setLayout(word_layout)
+
+        self.word_stack = QStackedWidget(self)
+        self.word_stack.addWidget(self.word_label)
+        self.word_stack.addWidget(self.word_container)
+        self.layout.addWidget(self.word_stack)
+        self.apply_font_size()
 
         # ---------------------------------------
         # 3. Przycisk do ładowania plików EPUB
@@ -333,83 +779,169 @@ class MainWindow(QMainWindow):
     def load_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Open EPUB File", "", "EPUB Files (*.epub)")
         if file_path:
-            # Zapisujemy, którą książkę wczytaliśmy
-            self.current_file_path = file_path
-
-            # Wczytanie tekstu z pliku
-            self.text = extract_text_from_epub(file_path)
-            self.word_label.setText("File loaded. Ready to start.")
-
-            # Wczytanie i wyświetlenie okładki
-            cover_data = extract_cover_image_from_epub(file_path)
-            if cover_data:
-                pixmap = QPixmap()
-                pixmap.loadFromData(cover_data)
-                # Skalowanie okładki, aby pasowała do widoku (np. 300x400)
-                pixmap = pixmap.scaled(300, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.cover_label.setPixmap(pixmap)
-            else:
-                self.cover_label.setText("No cover found.")
-
-            # Ustawienie paska postępu na wartości z pliku (jeśli istnieje)
-            start_index = load_progress(self.current_file_path)
-            total_words = len(self.text.split())
-            if total_words > 0:
-                progress_value = int(start_index / total_words * 100)
-                self.progress_bar.setValue(progress_value)
-            else:
-                self.progress_bar.setValue(0)
+            # Zatrzymujemy wyświetlanie poprzedniej książki
+            self.stop_display()
+
+            # Na czas wczytywania blokujemy przyciski, a pasek postępu
+            # pokazuje stan nieokreślony
+            self.set_loading(True)
+            self.show_message("Loading file...")
+
+            # Wczytanie tekstu i okładki odbywa się w puli wątków
+            self._loader = EpubLoader(file_path)
+            self._loader.signals.done.connect(self.on_file_loaded)
+            self._loader.signals.failed.connect(self.on_file_load_failed)
+            QThreadPool.globalInstance().start(self._loader)
+
+    def set_loading(self, loading):
+        """
+        Blokuje (lub odblokowuje) przyciski na czas wczytywania pliku EPUB.
+        """
+        for button in (self.load_button, self.start_button, self.reset_button):
+            button.setEnabled(not loading)
+        if loading:
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+
+    def on_file_loaded(self, file_path, text, cover_image):
+        self._loader = None
+        self.set_loading(False)
+
+        # Zapisujemy, którą książkę wczytaliśmy
+        self.current_file_path = file_path
+        self.current_index = None
+
+        self.text = text
+        self.word_index = WordIndex(self.text)
+        self.show_message("File loaded. Ready to start.")
+
+        # Wyświetlenie okładki (przeskalowanej już przez EpubLoader)
+        if cover_image is not None:
+            self.cover_label.setPixmap(QPixmap.fromImage(cover_image))
+        else:
+            self.cover_label.setText("No cover found.")
+
+        self.show_saved_progress()
+
+    def on_file_load_failed(self, file_path, error):
+        self._loader = None
+        self.set_loading(False)
+        # Zostajemy przy poprzednio wczytanej książce (jeśli była)
+        self.show_saved_progress()
+        self.show_message(f"Could not load {os.path.basename(file_path)}: {error}")
+
+    def show_saved_progress(self):
+        """
+        Ustawia pasek postępu na zapamiętany postęp bieżącej książki.
+        """
+        start_index = self._progress_cache.get(self.current_file_path, 0)
+        self.progress_bar.setValue(self.word_index.percent_read(start_index))
 
     def update_speed(self, value):
         self.words_per_minute = value
         self.speed_value.setText(f"{value}")
-        # Zapisz nowe ustawienia od razu
-        self.save_current_settings()
+        # Nowa prędkość działa od razu, bez restartu wyświetlania
+        self._timer.setInterval(self._word_interval())
+        # Zapisz nowe ustawienia, gdy użytkownik skończy przesuwać suwak
+        self._settings_save_timer.start()
 
     def update_font_size(self, value):
         self.font_size = value
         self.font_value.setText(f"{value}")
-        self.word_label.setStyleSheet(f"font-size: {self.font_size}px; background-color: rgb(235, 222, 200);")
-        # Zapisz nowe ustawienia od razu
-        self.save_current_settings()
+        self.apply_font_size()
+        # Zapisz nowe ustawienia, gdy użytkownik skończy przesuwać suwak
+        self._settings_save_timer.start()
 
     def start_display(self):
-        if not self.text:
-            self.word_label.setText("Please load an EPUB file first.")
+        if not self.word_index.has_word(0):
+            self.show_message("Please load an EPUB file first.")
             return
 
-        self.stop_display()  # zatrzymaj ewentualnie działający poprzedni wątek
-        self.thread = WordDisplayThread(self.current_file_path, self.text, self.words_per_minute)
-        self.thread.word_signal.connect(self.update_word_label)
-        self.thread.progress_signal.connect(self.update_progress)
-        self.thread.start()
+        self.stop_display()  # zatrzymaj ewentualnie trwające wyświetlanie
+        # Odczytujemy zapisany postęp dla danej książki
+        self._idx = self._progress_cache.get(self.current_file_path, 0)
+        self._last_flush = time.monotonic()
+        self._last_progress = -1
+        self._timer.start(self._word_interval())
+        # Pierwsze słowo pokazujemy od razu, kolejne co interwał timera
+        self._tick()
 
     def stop_display(self):
-        if self.thread:
-            self.thread.stop()
-            self.thread.wait()
-
-    def highlight_middle_letter(self, word):
-        if len(word) <= 1:
-            return word
-        middle_index = len(word) // 2
-        highlighted = (
-            word[:middle_index] +
-            f'<span style="color:red;">{word[middle_index]}</span>' +
-            word[middle_index + 1:]
-        )
-        return highlighted
+        if self._timer.isActive():
+            self._timer.stop()
+            self.flush_progress()
+
+    def _word_interval(self):
+        """
+        Zwraca czas wyświetlania jednego słowa (w ms) dla bieżącej prędkości.
+        """
+        return int(60000 / self.words_per_minute)
+
+    def _tick(self):
+        """
+        Wyświetla kolejne słowo, aktualizuje pasek postępu
+        i co jakiś czas zapisuje postęp czytania na dysk.
+        """
+        if not self.word_index.has_word(self._idx):
+            self.stop_display()
+            return
+
+        self.current_index = self._idx
+        self.update_word_label(self.word_index.word(self._idx))
+        # Procent zmienia się tylko co ~1% tekstu — pasek odświeżamy tylko wtedy
+        progress = self.word_index.percent_read(self._idx + 1)
+        if progress != self._last_progress:
+            self.update_progress(progress)
+            self._last_progress = progress
+        self._idx += 1
+
+        self._progress_cache[self.current_file_path] = self._idx
+        # Zapisujemy postęp w pliku JSON co PROGRESS_FLUSH_WORDS słów
+        # lub co PROGRESS_FLUSH_SECONDS sekund
+        if (self._idx % PROGRESS_FLUSH_WORDS == 0
+                or time.monotonic() - self._last_flush > PROGRESS_FLUSH_SECONDS):
+            self.flush_progress()
+
+    def flush_progress(self):
+        """
+        Zleca zapis trzymanych w pamięci postępów czytania do pliku JSON
+        (zapis wykonuje wątek ProgressWriter).
+        """
+        self._progress_writer.enqueue(dict(self._progress_cache))
+        self._last_flush = time.monotonic()
+
+    def apply_font_size(self):
+        """
+        Ustawia bieżącą wielkość czcionki labelkom z komunikatami i słowem.
+        """
+        style = f"font-size: {self.font_size}px; background-color: rgb(235, 222, 200);"
+        self.word_label.setStyleSheet(style)
+        self.left_lbl.setStyleSheet(style)
+        self.mid_lbl.setStyleSheet(style + " color: red;")
+        self.right_lbl.setStyleSheet(style)
+
+    def show_message(self, message):
+        """
+        Wyświetla komunikat w miejscu czytanego słowa.
+        """
+        self.word_label.setText(message)
+        self.word_stack.setCurrentWidget(self.word_label)
 
     def update_word_label(self, word):
-        highlighted_word = self.highlight_middle_letter(word)
-        self.word_label.setText(f'<html><body style="text-align:center;">{highlighted_word}</body></html>')
+        left, middle, right = _split_word(word)
+        self.left_lbl.setText(left)
+        self.mid_lbl.setText(middle)
+        self.right_lbl.setText(right)
+        if self.word_stack.currentWidget() is not self.word_container:
+            self.word_stack.setCurrentWidget(self.word_container)
 
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
     def show_context(self):
-        if self.thread and self.text:
-            context_window = ContextWindow(self, self.text, self.thread.current_index)
+        if self.current_index is not None:
+            context_window = ContextWindow(self, self.word_index, self.current_index)
             context_window.exec_()
 
     def reset_progress(self):
@@ -417,13 +949,33 @@ class MainWindow(QMainWindow):
         Resetuje postęp czytania (ustawia go na 0) dla aktualnie wczytanej książki.
         """
         if self.current_file_path:
-            save_progress(self.current_file_path, 0)
+            # Jeśli słowa są właśnie wyświetlane, zaczynamy od początku książki
+            self._idx = 0
+            self._progress_cache[self.current_file_path] = 0
+            self.flush_progress()
             self.progress_bar.setValue(0)
-            self.word_label.setText("Progress has been reset to the start.")
+            self.show_message("Progress has been reset to the start.")
 
-    def closeEvent(self, event):
-        # Zatrzymaj wyświetlanie słów
+    def shutdown(self):
+        """
+        Zapisuje bieżący stan i kończy wątek ProgressWriter.
+        Wywoływana przy zamknięciu okna oraz przy zakończeniu aplikacji
+        (aboutToQuit); kolejne wywołania nic nie robią.
+        """
+        if not self._progress_writer.isRunning():
+            return
+        # Zatrzymaj wyświetlanie słów (i zapisz ostatni postęp)
         self.stop_display()
+        # Zapisz ustawienia, jeśli czekały jeszcze na zapis
+        if self._settings_save_timer.isActive():
+            self._settings_save_timer.stop()
+            self.save_current_settings()
+        # Poczekaj, aż wszystkie zlecone zapisy postępu trafią na dysk
+        self._progress_writer.stop()
+        self._progress_writer.wait()
+
+    def closeEvent(self, event):
+        self.shutdown()
         # Zamknij okno
         event.accept()
 